@@ -10,7 +10,25 @@ class Config:
     # RAG Settings
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
+    CHUNK_MAX_TOKENS = 400  # Token budget per chunk when tiktoken is installed (embed limit is 512;
+                            # cl100k only approximates Cohere's tokenizer, so leave ~20% headroom)
     TOP_K = 3
+    EMBED_BATCH_SIZE = 96  # Cohere's max texts per embed request
+    EMBED_MAX_WORKERS = 4  # Embed batches in flight at once
+    INT8_EMBEDDINGS = False  # Store the index as int8 (4x less memory, approximate scores)
+    VECTOR_INDEX = "flat"  # "flat" (exact FAISS, skipped for memory-mapped embeddings), "hnsw" (approximate FAISS) or "numpy"
+    HNSW_M = 32  # Graph degree for the HNSW index
+    MEMMAP_EMBEDDINGS = True  # Memory-map the cached embedding matrix instead of loading it into RAM
+    
+    # Semantic answer cache
+    QUERY_CACHE_SIZE = 256
+    QUERY_CACHE_THRESHOLD = 0.97
+    
+    # Local cache for embeddings and processed documents
+    CACHE_DIR = os.getenv("RAG_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rag_qa_bot"))
+    EMBEDDING_CACHE_PATH = os.path.join(CACHE_DIR, "embeddings.sqlite3")
+    INDEX_CACHE_DIR = os.path.join(CACHE_DIR, "indexes")
+    DOCUMENT_CACHE_DIR = os.path.join(CACHE_DIR, "documents")
     
     # Models
     EMBEDDING_MODEL = "embed-english-v3.0"
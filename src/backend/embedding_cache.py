@@ -0,0 +1,57 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+class EmbeddingCache:
+    """Disk-backed cache of chunk embeddings keyed by (chunk hash, model)"""
+    
+    # Stay well below SQLite's bound-parameter limit
+    _MAX_PARAMS = 500
+    
+    def __init__(self, db_path: str, model: str):
+        self.model = model
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "hash TEXT, model TEXT, vec BLOB, PRIMARY KEY (hash, model))"
+            )
+    
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Return the cache key for a chunk of text"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def get_many(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """Look up cached vectors, returning only the hashes that were found"""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for start in range(0, len(unique), self._MAX_PARAMS):
+                batch = unique[start:start + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    [self.model, *batch]
+                )
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def put_many(self, hashes: List[str], vecs) -> None:
+        """Store vectors for the given hashes, replacing existing entries"""
+        rows = [
+            (text_hash, self.model, np.asarray(vec, dtype=np.float32).tobytes())
+            for text_hash, vec in zip(hashes, vecs)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, model, vec) VALUES (?, ?, ?)",
+                rows
+            )
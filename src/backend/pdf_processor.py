@@ -1,52 +1,87 @@
 import PyPDF2
 from typing import List, Tuple
+import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract text from pages [start, stop) - runs in a worker process"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() for i in range(start, stop)]
 
 class SimplePDFProcessor:
-    def __init__(self, chunk_size=1000, chunk_overlap=200):
+    def __init__(self, chunk_size=1000, chunk_overlap=200, max_workers=None):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 4)
+    
+    def _extract_text(self, pdf_path: str, pdf_reader) -> List[str]:
+        """Extract page texts in order, fanning out to worker processes for large PDFs"""
+        n_pages = len(pdf_reader.pages)
+        if self.max_workers <= 1 or n_pages < PARALLEL_MIN_PAGES:
+            return [page.extract_text() for page in pdf_reader.pages]
+        
+        # Each worker opens its own reader over a contiguous page range
+        step = -(-n_pages // self.max_workers)
+        ranges = [(start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(_extract_pages, pdf_path, start, stop)
+                           for start, stop in ranges]
+                return [text for future in futures for text in future.result()]
+        except Exception as e:
+            logger.warning("⚠️ Parallel extraction failed, falling back to sequential: %s", e)
+            return [page.extract_text() for page in pdf_reader.pages]
     
     def load_pdf(self, pdf_path: str) -> List[str]:
         """Load PDF and split into chunks"""
         try:
-            print(f"📄 Loading PDF: {pdf_path}")
+            logger.info("📄 Loading PDF: %s", pdf_path)
             
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 
                 # Extract text from all pages
-                full_text = ""
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    full_text += text + "\n\n"
+                full_text = "\n\n".join(self._extract_text(pdf_path, pdf_reader))
                 
                 # Clean text
-                full_text = re.sub(r'\s+', ' ', full_text).strip()
+                full_text = _WHITESPACE_RE.sub(' ', full_text).strip()
                 
                 # Simple chunking by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', full_text)
+                sentences = _SENTENCE_END_RE.split(full_text)
                 
                 chunks = []
-                current_chunk = ""
+                current_chunk = []
+                current_len = 0  # Length of " ".join(current_chunk) + " "
                 
                 for sentence in sentences:
-                    if len(current_chunk) + len(sentence) < self.chunk_size:
-                        current_chunk += sentence + " "
+                    if current_len + len(sentence) < self.chunk_size:
+                        current_chunk.append(sentence)
+                        current_len += len(sentence) + 1
                     else:
                         if current_chunk:
-                            chunks.append(current_chunk.strip())
-                        current_chunk = sentence + " "
+                            chunks.append(" ".join(current_chunk).strip())
+                        current_chunk = [sentence]
+                        current_len = len(sentence) + 1
                 
                 if current_chunk:
-                    chunks.append(current_chunk.strip())
+                    chunks.append(" ".join(current_chunk).strip())
                 
-                print(f"✅ Created {len(chunks)} chunks")
+                logger.info("✅ Created %s chunks", len(chunks))
                 return chunks
                 
         except Exception as e:
-            print(f"❌ Error loading PDF: {e}")
+            logger.error("❌ Error loading PDF: %s", e)
             return []
     
     def process_pdf(self, pdf_path: str) -> Tuple[List[str], bool]:
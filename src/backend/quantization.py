@@ -0,0 +1,28 @@
+import numpy as np
+from typing import Tuple
+
+# simsimd is optional; without it int8 scoring falls back to a NumPy int32 matmul
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    simsimd = None
+    SIMSIMD_AVAILABLE = False
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantize float vectors to int8 with one scale per vector"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(vectors / scales[:, np.newaxis]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+def int8_dot(matrix: np.ndarray, scales: np.ndarray, query: np.ndarray, query_scale: float) -> np.ndarray:
+    """Approximate float dot products of int8 rows with an int8 query"""
+    if SIMSIMD_AVAILABLE:
+        # SIMD int8 inner products over all rows in one call
+        raw = np.asarray(simsimd.cdist(query[np.newaxis, :], matrix, "inner"))[0]
+    else:
+        # Accumulate in int32 - int8/int16 products overflow at typical dims
+        raw = np.matmul(matrix, query, dtype=np.int32)
+    return raw.astype(np.float32) * scales * np.float32(query_scale)
@@ -1,26 +1,71 @@
 import cohere
 import numpy as np
 from typing import List, Dict, Tuple
+import functools
 import json
+import logging
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from simple_pdf_processor import SimplePDFProcessor
+from embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+_PROMPT_TMPL = """Based on the following context from a document, answer the question.
+            
+CONTEXT:
+{context}
+
+QUESTION: {question}
+
+INSTRUCTIONS:
+1. Answer based ONLY on the context provided
+2. If the context doesn't contain the answer, say "I cannot find this information in the document"
+3. Be concise and accurate
+4. Reference which source(s) you used
+
+ANSWER:"""
+
+@functools.lru_cache(maxsize=1)
+def _client() -> cohere.Client:
+    """Shared Cohere client, created once per process"""
+    return cohere.Client(Config.COHERE_API_KEY)
+
+def _batch_cohere(texts: List[str], max_items: int = Config.EMBED_BATCH_SIZE):
+    """Yield slices of texts sized to Cohere's per-request embed limit"""
+    for start in range(0, len(texts), max_items):
+        yield texts[start:start + max_items]
+
+def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k highest scores, best first, without a full sort"""
+    k = min(top_k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top_idx = np.argpartition(-scores, k - 1)[:k]
+    return top_idx[np.argsort(-scores[top_idx])]
 
 class SimpleRAGSystem:
     def __init__(self):
         """Initialize the RAG system"""
-        self.co = cohere.Client(Config.COHERE_API_KEY)
+        self.co = _client()
         self.pdf_processor = SimplePDFProcessor(
             chunk_size=Config.CHUNK_SIZE,
             chunk_overlap=Config.CHUNK_OVERLAP
         )
+        self.embedding_cache = EmbeddingCache(
+            Config.EMBEDDING_CACHE_PATH,
+            model=Config.EMBEDDING_MODEL
+        )
         self.documents = []  # Store document chunks
-        self.embeddings = []  # Store embeddings
+        self.embeddings = np.empty((0, 0), dtype=np.float32)  # L2-normalized (n_chunks, dim)
         self.metadata = []  # Store metadata
     
     def process_document(self, pdf_path: str) -> bool:
         """Process a PDF document"""
-        print(f"\n🔄 Processing document: {os.path.basename(pdf_path)}")
+        logger.info("🔄 Processing document: %s", os.path.basename(pdf_path))
         
         # Load and chunk PDF
         chunks, success = self.pdf_processor.process_pdf(pdf_path)
@@ -29,41 +74,68 @@ class SimpleRAGSystem:
         
         # Generate embeddings
         try:
-            print("🔧 Generating embeddings...")
-            response = self.co.embed(
-                texts=chunks,
-                model=Config.EMBEDDING_MODEL,
-                input_type="search_document"
-            )
+            logger.info("🔧 Generating embeddings...")
+            matrix = self._embed_chunks(chunks)
             
             # Store everything
             self.documents = chunks
-            self.embeddings = response.embeddings
+            
+            # Normalize once so similarity is a plain dot product
+            matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True).clip(min=1e-12)
+            self.embeddings = matrix
+            
             self.metadata = [{"source": os.path.basename(pdf_path), "chunk_id": i} 
                            for i in range(len(chunks))]
             
-            print(f"✅ Successfully processed {len(chunks)} chunks")
+            logger.info("✅ Successfully processed %s chunks", len(chunks))
             return True
             
         except Exception as e:
-            print(f"❌ Error generating embeddings: {e}")
+            logger.error("❌ Error generating embeddings: %s", e)
             return False
     
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors"""
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """Embed document chunks, reusing cached vectors where possible"""
+        hashes = [EmbeddingCache.hash_text(chunk) for chunk in chunks]
+        vectors = self.embedding_cache.get_many(hashes)
+        
+        uncached_idx = [i for i, h in enumerate(hashes) if h not in vectors]
+        if len(uncached_idx) < len(chunks):
+            logger.info("♻️ Reusing %s cached embeddings", len(chunks) - len(uncached_idx))
         
-        if norm1 == 0 or norm2 == 0:
-            return 0
+        if uncached_idx:
+            # Keep a few batches in flight; results are read back in submit order
+            with ThreadPoolExecutor(max_workers=Config.EMBED_MAX_WORKERS) as executor:
+                futures = []
+                for n, batch in enumerate(_batch_cohere([chunks[i] for i in uncached_idx])):
+                    if n:
+                        time.sleep(random.random() * 0.05)  # Jitter to avoid 429 bursts
+                    futures.append(executor.submit(
+                        self.co.embed,
+                        texts=batch,
+                        model=Config.EMBEDDING_MODEL,
+                        input_type="search_document"
+                    ))
+                
+                vecs = []
+                for future in futures:
+                    vecs.extend(future.result().embeddings)
+            fresh = np.asarray(vecs, dtype=np.float32)
+            fresh_hashes = [hashes[i] for i in uncached_idx]
+            self.embedding_cache.put_many(fresh_hashes, fresh)
+            vectors.update(zip(fresh_hashes, fresh))
         
-        return dot_product / (norm1 * norm2)
+        return np.stack([vectors[h] for h in hashes])
+    
+    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
+        """Calculate cosine similarity between two L2-normalized vectors"""
+        return float(np.dot(vec1, vec2))
     
     def search(self, query: str, top_k: int = Config.TOP_K) -> List[Dict]:
         """Search for relevant documents"""
-        if not self.embeddings:
-            print("⚠️ No documents loaded yet")
+        if self.embeddings.shape[0] == 0:
+            logger.warning("⚠️ No documents loaded yet")
             return []
         
         try:
@@ -76,33 +148,31 @@ class SimpleRAGSystem:
             query_embedding = query_response.embeddings[0]
             
             # Calculate similarities
-            similarities = []
-            for i, doc_embedding in enumerate(self.embeddings):
-                similarity = self._cosine_similarity(query_embedding, doc_embedding)
-                similarities.append((i, similarity))
+            query_vec = np.asarray(query_embedding, dtype=np.float32)
+            query_vec /= np.linalg.norm(query_vec) or 1.0
+            scores = self.embeddings @ query_vec
             
-            # Sort by similarity (highest first)
-            similarities.sort(key=lambda x: x[1], reverse=True)
+            top_idx = _top_k_indices(scores, top_k)
             
             # Get top-k results
             results = []
-            for i, (doc_idx, score) in enumerate(similarities[:top_k]):
+            for i, doc_idx in enumerate(top_idx):
                 results.append({
                     "id": i + 1,
                     "text": self.documents[doc_idx],
-                    "score": float(score),
+                    "score": float(scores[doc_idx]),
                     "metadata": self.metadata[doc_idx]
                 })
             
             return results
             
         except Exception as e:
-            print(f"❌ Error during search: {e}")
+            logger.error("❌ Error during search: %s", e)
             return []
     
     def answer_question(self, question: str) -> Dict:
         """Answer a question based on documents"""
-        print(f"\n❓ Question: {question}")
+        logger.debug("❓ Question: %s", question)
         
         # 1. Search for relevant chunks
         relevant_chunks = self.search(question)
@@ -118,28 +188,15 @@ class SimpleRAGSystem:
         # 2. Prepare context
         context_parts = []
         for chunk in relevant_chunks:
-            context_parts.append(f"[Source {chunk['id']}, Relevance: {chunk['score']:.2%}]\n{chunk['text']}")
+            context_parts.append(f"[Source {chunk['id']}]\n{chunk['text']}")
         
         context = "\n\n".join(context_parts)
         
         # 3. Generate answer
         try:
-            print("🤖 Generating answer...")
-            
-            prompt = f"""Based on the following context from a document, answer the question.
+            logger.debug("🤖 Generating answer...")
             
-CONTEXT:
-{context}
-
-QUESTION: {question}
-
-INSTRUCTIONS:
-1. Answer based ONLY on the context provided
-2. If the context doesn't contain the answer, say "I cannot find this information in the document"
-3. Be concise and accurate
-4. Reference which source(s) you used
-
-ANSWER:"""
+            prompt = _PROMPT_TMPL.format(context=context, question=question)
             
             response = self.co.generate(
                 model=Config.GENERATION_MODEL,
@@ -170,7 +227,7 @@ ANSWER:"""
         """Get system statistics"""
         return {
             "documents_loaded": len(self.documents),
-            "embeddings_created": len(self.embeddings),
+            "embeddings_created": self.embeddings.shape[0],
             "chunk_size": Config.CHUNK_SIZE,
             "top_k": Config.TOP_K
         }
@@ -194,4 +251,5 @@ def test_rag():
     print("\nTo run the app: streamlit run src/frontend/app.py")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_rag()
\ No newline at end of file
@@ -1,52 +1,183 @@
 import pypdf
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
+import functools
+import logging
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Prefer the native pdfium binding for text extraction when it is installed
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    pdfium = None
+    PDFIUM_AVAILABLE = False
+
+# tiktoken is optional; without it chunks are sized by characters
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+# tiktoken downloads its BPE file on first use with no timeout, so bound the wait
+TOKENIZER_LOAD_TIMEOUT = 10  # seconds
+
+def _page_count(pdf_path: str) -> int:
+    """Return the number of pages in a PDF"""
+    if PDFIUM_AVAILABLE:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    
+    with open(pdf_path, 'rb') as file:
+        return len(pypdf.PdfReader(file).pages)
+
+def _pdfium_page_text(pdf, page_num: int) -> str:
+    """Extract text from one pdfium page, releasing native handles"""
+    page = pdf[page_num]
+    textpage = page.get_textpage()
+    try:
+        return textpage.get_text_bounded()
+    finally:
+        textpage.close()
+        page.close()
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract text from pages [start, stop) - also runs in worker processes"""
+    if PDFIUM_AVAILABLE:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return [_pdfium_page_text(pdf, i) for i in range(start, stop)]
+        finally:
+            pdf.close()
+    
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = pypdf.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() for i in range(start, stop)]
+
+@functools.lru_cache(maxsize=1)
+def default_token_counter() -> Optional[Callable[[List[str]], List[int]]]:
+    """Return a local batch token counter, or None if no tokenizer is available.
+    
+    Memoized, including failures, so an unreachable download is only tried once per process.
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    
+    # Load in a daemon thread so a hung download can't block processing (or interpreter exit)
+    loaded = {}
+    def load():
+        try:
+            loaded["encoding"] = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            loaded["error"] = e
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    thread.join(TOKENIZER_LOAD_TIMEOUT)
+    
+    encoding = loaded.get("encoding")
+    if encoding is None:
+        error = loaded.get("error", f"timed out after {TOKENIZER_LOAD_TIMEOUT}s")
+        logger.warning("⚠️ Tokenizer unavailable, chunking by characters: %s", error)
+        return None
+    return lambda texts: [len(tokens) for tokens in encoding.encode_batch(texts, disallowed_special=())]
 
 class SimplePDFProcessor:
-    def __init__(self, chunk_size=1000, chunk_overlap=200):
+    def __init__(self, chunk_size=1000, chunk_overlap=200, max_workers=None,
+                 max_tokens=None, token_counter=None):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 4)
+        
+        # With a token budget, chunks are packed by tokens instead of characters;
+        # the default tokenizer is loaded on first use, not at construction
+        self.max_tokens = max_tokens
+        self._token_counter = token_counter
+    
+    @property
+    def token_counter(self) -> Optional[Callable[[List[str]], List[int]]]:
+        """Batch token counter used for packing, or None to pack by characters"""
+        if not self.max_tokens:
+            return None
+        if self._token_counter is None:
+            self._token_counter = default_token_counter()
+        return self._token_counter
+    
+    def _extract_text(self, pdf_path: str) -> List[str]:
+        """Extract page texts in order, fanning out to worker processes for large PDFs"""
+        n_pages = _page_count(pdf_path)
+        if self.max_workers <= 1 or n_pages < PARALLEL_MIN_PAGES:
+            return _extract_pages(pdf_path, 0, n_pages)
+        
+        # Each worker opens its own reader over a contiguous page range
+        step = -(-n_pages // self.max_workers)
+        ranges = [(start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(_extract_pages, pdf_path, start, stop)
+                           for start, stop in ranges]
+                return [text for future in futures for text in future.result()]
+        except Exception as e:
+            logger.warning("⚠️ Parallel extraction failed, falling back to sequential: %s", e)
+            return _extract_pages(pdf_path, 0, n_pages)
     
     def load_pdf(self, pdf_path: str) -> List[str]:
         """Load PDF and split into chunks"""
         try:
-            print(f"📄 Loading PDF: {pdf_path}")
-            
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = pypdf.PdfReader(file)
-                
-                # Extract text from all pages
-                full_text = ""
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    full_text += text + "\n\n"
-                
-                # Clean text
-                full_text = re.sub(r'\s+', ' ', full_text).strip()
-                
-                # Simple chunking by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', full_text)
-                
-                chunks = []
-                current_chunk = ""
-                
-                for sentence in sentences:
-                    if len(current_chunk) + len(sentence) < self.chunk_size:
-                        current_chunk += sentence + " "
-                    else:
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                        current_chunk = sentence + " "
-                
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                
-                print(f"✅ Created {len(chunks)} chunks")
-                return chunks
-                
+            logger.info("📄 Loading PDF: %s", pdf_path)
+            
+            # Extract text from all pages
+            full_text = "\n\n".join(self._extract_text(pdf_path))
+            
+            # Clean text
+            full_text = _WHITESPACE_RE.sub(' ', full_text).strip()
+            
+            # Simple chunking by sentences
+            sentences = _SENTENCE_END_RE.split(full_text)
+            
+            if self.token_counter is not None:
+                costs = self.token_counter(sentences)
+                limit = self.max_tokens
+            else:
+                costs = [len(sentence) + 1 for sentence in sentences]  # Sentence plus joining space
+                limit = self.chunk_size
+            
+            chunks = []
+            current_chunk = []
+            current_size = 0
+            
+            for sentence, cost in zip(sentences, costs):
+                if current_size + cost <= limit:
+                    current_chunk.append(sentence)
+                    current_size += cost
+                else:
+                    if current_chunk:
+                        chunks.append(" ".join(current_chunk).strip())
+                    current_chunk = [sentence]
+                    current_size = cost
+            
+            if current_chunk:
+                chunks.append(" ".join(current_chunk).strip())
+            
+            logger.info("✅ Created %s chunks", len(chunks))
+            return chunks
+            
         except Exception as e:
-            print(f"❌ Error loading PDF: {e}")
+            logger.error("❌ Error loading PDF: %s", e)
             return []
     
     def process_pdf(self, pdf_path: str) -> Tuple[List[str], bool]:
@@ -1,31 +1,108 @@
 import cohere
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple
+import functools
+import hashlib
+import json
+import logging
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Local imports
 from config import Config
 from simple_pdf_processor import SimplePDFProcessor
+from embedding_cache import EmbeddingCache
+from quantization import quantize_int8, int8_dot
+
+# FAISS is optional; without it search falls back to a NumPy matmul
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_PROMPT_TMPL = """You are a helpful assistant that answers questions based on the provided context.
+
+CONTEXT FROM DOCUMENT:
+{context}
+
+INSTRUCTIONS:
+1. Answer the question based ONLY on the context provided above
+2. If the context doesn't contain the answer, say "I cannot find this information in the document"
+3. Be concise and accurate
+4. Reference which source(s) you used when applicable
+5. If the question is about the document's main topic, summarize what the document is about
+
+QUESTION: {question}
+
+ANSWER:"""
+
+@functools.lru_cache(maxsize=1)
+def _client() -> cohere.Client:
+    """Shared Cohere client, created once per process"""
+    return cohere.Client(Config.COHERE_API_KEY)
+
+@functools.lru_cache(maxsize=1)
+def _embedding_cache() -> EmbeddingCache:
+    """Shared on-disk embedding cache, opened once per process"""
+    return EmbeddingCache(Config.EMBEDDING_CACHE_PATH, model=Config.EMBEDDING_MODEL)
+
+def _batch_cohere(texts: List[str], max_items: int = Config.EMBED_BATCH_SIZE):
+    """Yield slices of texts sized to Cohere's per-request embed limit"""
+    for start in range(0, len(texts), max_items):
+        yield texts[start:start + max_items]
+
+def _normalize(embedding) -> np.ndarray:
+    """Return an embedding as an L2-normalized float32 vector"""
+    vec = np.asarray(embedding, dtype=np.float32)
+    vec /= np.linalg.norm(vec) or 1.0
+    return vec
+
+def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k highest scores, best first, without a full sort"""
+    k = min(top_k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top_idx = np.argpartition(-scores, k - 1)[:k]
+    return top_idx[np.argsort(-scores[top_idx])]
 
 class SimpleRAGSystem:
     def __init__(self):
         """Initialize the RAG system"""
-        print("🚀 Initializing SimpleRAGSystem...")
+        logger.info("🚀 Initializing SimpleRAGSystem...")
         try:
-            self.co = cohere.Client(Config.COHERE_API_KEY)
-            print(f"✅ Cohere client initialized with key: {Config.COHERE_API_KEY[:10]}...")
+            self.co = _client()
+            logger.info("✅ Cohere client initialized with key: %s...", Config.COHERE_API_KEY[:10])
         except Exception as e:
-            print(f"❌ Failed to initialize Cohere client: {e}")
+            logger.error("❌ Failed to initialize Cohere client: %s", e)
             raise
         
         self.pdf_processor = SimplePDFProcessor(
             chunk_size=Config.CHUNK_SIZE,
-            chunk_overlap=Config.CHUNK_OVERLAP
+            chunk_overlap=Config.CHUNK_OVERLAP,
+            max_tokens=Config.CHUNK_MAX_TOKENS
         )
+        self.embedding_cache = _embedding_cache()
         self.documents = []  # Store document chunks
-        self.embeddings = []  # Store embeddings
+        self.embeddings = np.empty((0, 0), dtype=np.float32)  # L2-normalized (n_chunks, dim)
+        self._emb_scales = None  # Per-row scales when embeddings are int8
+        self.index = None  # FAISS index over the normalized embeddings, if enabled
         self.metadata = []  # Store metadata
-        print("✅ SimpleRAGSystem initialized successfully!")
+        
+        # Semantic cache of recent answers, keyed by normalized query embedding
+        # (locked, since concurrent callers may share one loaded document)
+        self._q_lock = threading.Lock()
+        self._q_matrix = None  # (n_cached, dim) float32
+        self._q_results = []  # Cached answer dicts, parallel to _q_matrix rows
+        self._q_last_used = []  # LRU clock value per cached row
+        self._q_clock = 0
+        logger.info("✅ SimpleRAGSystem initialized successfully!")
     
     def process_pdf(self, pdf_path: str) -> bool:
         """Process a PDF document - This is what the app expects"""
@@ -33,202 +110,509 @@ class SimpleRAGSystem:
     
     def process_document(self, pdf_path: str) -> bool:
         """Process a PDF document"""
-        print(f"\n🔄 Processing document: {os.path.basename(pdf_path)}")
+        logger.info("🔄 Processing document: %s", os.path.basename(pdf_path))
         
         # Check if file exists
         if not os.path.exists(pdf_path):
-            print(f"❌ File not found: {pdf_path}")
+            logger.error("❌ File not found: %s", pdf_path)
             return False
         
+        # Reuse a previous run's results for the same file, if any
+        cache_path = self._document_cache_path(pdf_path)
+        if self._load_document_cache(cache_path):
+            logger.info("✅ Loaded %s chunks from cache", len(self.documents))
+            return True
+        
         # Load and chunk PDF
-        print("📄 Loading and chunking PDF...")
+        logger.info("📄 Loading and chunking PDF...")
         chunks, success = self.pdf_processor.process_pdf(pdf_path)
         if not success:
-            print("❌ Failed to process PDF")
+            logger.error("❌ Failed to process PDF")
             return False
         
-        print(f"📊 Created {len(chunks)} chunks")
+        logger.info("📊 Created %s chunks", len(chunks))
         
         # Generate embeddings
         try:
-            print("🔧 Generating embeddings...")
-            response = self.co.embed(
-                texts=chunks,
-                model=Config.EMBEDDING_MODEL,
-                input_type="search_document"
-            )
+            logger.info("🔧 Generating embeddings...")
+            matrix = self._embed_chunks(chunks)
             
-            # Store everything
-            self.documents = chunks
-            self.embeddings = response.embeddings
-            self.metadata = [{"source": os.path.basename(pdf_path), "chunk_id": i} 
-                           for i in range(len(chunks))]
+            # Normalize once so similarity is a plain dot product
+            matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True).clip(min=1e-12)
             
-            print(f"✅ Successfully processed {len(chunks)} chunks")
+            metadata = [{"source": os.path.basename(pdf_path), "chunk_id": i} 
+                        for i in range(len(chunks))]
+            
+            # Store everything, switching to the on-disk copy when memory-mapping
+            if self._save_document_cache(cache_path, chunks, matrix, metadata) and Config.MEMMAP_EMBEDDINGS:
+                matrix = np.load(f"{cache_path}.npy", mmap_mode="r")
+            self._set_document(chunks, matrix, metadata)
+            
+            logger.info("✅ Successfully processed %s chunks", len(chunks))
             return True
             
         except Exception as e:
-            print(f"❌ Error generating embeddings: {e}")
+            logger.error("❌ Error generating embeddings: %s", e)
+            return False
+    
+    def _set_document(self, chunks: List[str], matrix: np.ndarray, metadata: List[Dict]):
+        """Install chunks and their normalized embeddings as the active document"""
+        self.documents = chunks
+        if Config.INT8_EMBEDDINGS:
+            self.embeddings, self._emb_scales = quantize_int8(matrix)
+        else:
+            self.embeddings, self._emb_scales = matrix, None
+        self.index = self._build_index(matrix, chunks)
+        self.metadata = metadata
+        
+        # Cached answers refer to the previous document
+        self._clear_query_cache()
+    
+    def _document_cache_path(self, pdf_path: str) -> str:
+        """Base path (without extension) of the processed-document cache for this file's contents"""
+        digest = hashlib.sha256()
+        by_tokens = self.pdf_processor.token_counter is not None
+        digest.update(f"{Config.EMBEDDING_MODEL}:{Config.CHUNK_SIZE}:{Config.CHUNK_MAX_TOKENS}:{by_tokens}:".encode("utf-8"))
+        with open(pdf_path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        return os.path.join(Config.DOCUMENT_CACHE_DIR, digest.hexdigest())
+    
+    def _load_document_cache(self, cache_path: str) -> bool:
+        """Restore a processed document from disk, returning True on success"""
+        if not (os.path.exists(f"{cache_path}.npz") and os.path.exists(f"{cache_path}.npy")):
+            return False
+        
+        try:
+            with np.load(f"{cache_path}.npz") as data:
+                chunks = data["docs"].tolist()
+                metadata = json.loads(str(data["meta"]))
+            
+            # A memory-mapped matrix lets the OS page rows in as search touches them
+            matrix = np.load(f"{cache_path}.npy", mmap_mode="r" if Config.MEMMAP_EMBEDDINGS else None)
+            if matrix.dtype != np.float32 or matrix.shape[0] != len(chunks):
+                raise ValueError("embedding matrix does not match cached chunks")
+            self._set_document(chunks, matrix, metadata)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Ignoring unreadable document cache: %s", e)
+            return False
+    
+    def _save_document_cache(self, cache_path: str, chunks: List[str], matrix: np.ndarray, metadata: List[Dict]) -> bool:
+        """Write a processed document to disk so later runs can skip processing"""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            
+            # Embeddings go in a plain .npy so they can be memory-mapped on load
+            with open(f"{cache_path}.npy.tmp", 'wb') as file:
+                np.save(file, matrix)
+            os.replace(f"{cache_path}.npy.tmp", f"{cache_path}.npy")
+            
+            with open(f"{cache_path}.npz.tmp", 'wb') as file:
+                np.savez(file, docs=np.array(chunks), meta=np.array(json.dumps(metadata)))
+            os.replace(f"{cache_path}.npz.tmp", f"{cache_path}.npz")
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Could not cache processed document: %s", e)
             return False
     
     def query(self, question: str) -> str:
         """Simple query interface - returns just the answer string"""
-        print(f"\n❓ Query: {question}")
+        logger.debug("❓ Query: %s", question)
         
         result = self.answer_question(question)
         return result.get("answer", "No answer available")
     
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors"""
+    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """Embed document chunks, reusing cached vectors where possible"""
+        hashes = [EmbeddingCache.hash_text(chunk) for chunk in chunks]
+        vectors = self.embedding_cache.get_many(hashes)
+        
+        uncached_idx = [i for i, h in enumerate(hashes) if h not in vectors]
+        if len(uncached_idx) < len(chunks):
+            logger.info("♻️ Reusing %s cached embeddings", len(chunks) - len(uncached_idx))
+        
+        if uncached_idx:
+            # Keep a few batches in flight; results are read back in submit order
+            with ThreadPoolExecutor(max_workers=Config.EMBED_MAX_WORKERS) as executor:
+                futures = []
+                for n, batch in enumerate(_batch_cohere([chunks[i] for i in uncached_idx])):
+                    if n:
+                        time.sleep(random.random() * 0.05)  # Jitter to avoid 429 bursts
+                    futures.append(executor.submit(
+                        self.co.embed,
+                        texts=batch,
+                        model=Config.EMBEDDING_MODEL,
+                        input_type="search_document"
+                    ))
+                
+                vecs = []
+                for future in futures:
+                    vecs.extend(future.result().embeddings)
+            fresh = np.asarray(vecs, dtype=np.float32)
+            fresh_hashes = [hashes[i] for i in uncached_idx]
+            self.embedding_cache.put_many(fresh_hashes, fresh)
+            vectors.update(zip(fresh_hashes, fresh))
+        
+        return np.stack([vectors[h] for h in hashes])
+    
+    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
+        """Calculate cosine similarity between two L2-normalized vectors"""
+        try:
+            return float(np.dot(vec1, vec2))
+        except Exception as e:
+            logger.error("❌ Error calculating cosine similarity: %s", e)
+            return 0
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a query and return it as an L2-normalized float32 vector"""
+        logger.debug("🔍 Embedding query...")
+        query_response = self.co.embed(
+            texts=[query],
+            model=Config.EMBEDDING_MODEL,
+            input_type="search_query"
+        )
+        return _normalize(query_response.embeddings[0])
+    
+    def _build_index(self, matrix: np.ndarray, chunks: List[str]):
+        """Build (or load from disk) a FAISS index over normalized embeddings"""
+        if not FAISS_AVAILABLE or Config.VECTOR_INDEX not in ("flat", "hnsw") or Config.INT8_EMBEDDINGS:
+            return None
+        
+        # A flat index would copy a memory-mapped matrix into RAM (and duplicate the .npy
+        # on disk) for the same exact scores - search the memmap with a matmul instead
+        if Config.VECTOR_INDEX == "flat" and isinstance(matrix, np.memmap):
+            return None
+        
+        key = hashlib.sha256()
+        key.update(f"{Config.EMBEDDING_MODEL}:{Config.VECTOR_INDEX}:{Config.HNSW_M}".encode("utf-8"))
+        for chunk in chunks:
+            key.update(chunk.encode("utf-8") + b"\0")
+        index_path = os.path.join(Config.INDEX_CACHE_DIR, f"{key.hexdigest()}.faiss")
+        
         try:
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
+            if os.path.exists(index_path):
+                logger.info("♻️ Loading cached FAISS index")
+                return faiss.read_index(index_path)
             
-            if norm1 == 0 or norm2 == 0:
-                return 0
+            # Inner product equals cosine similarity on normalized vectors
+            dim = matrix.shape[1]
+            if Config.VECTOR_INDEX == "hnsw":
+                index = faiss.IndexHNSWFlat(dim, Config.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexFlatIP(dim)
+            index.add(matrix)
             
-            return dot_product / (norm1 * norm2)
+            os.makedirs(Config.INDEX_CACHE_DIR, exist_ok=True)
+            faiss.write_index(index, index_path)
+            return index
         except Exception as e:
-            print(f"❌ Error calculating cosine similarity: {e}")
-            return 0
+            logger.warning("⚠️ FAISS index unavailable, using brute-force search: %s", e)
+            return None
+    
+    def _rank(self, query_vec: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """Return (chunk index, score) pairs for the top_k chunks, best first"""
+        if self.index is not None:
+            k = min(top_k, self.index.ntotal)
+            if k <= 0:
+                return []
+            scores, ids = self.index.search(query_vec[np.newaxis, :], k)
+            return [(int(i), float(score)) for i, score in zip(ids[0], scores[0]) if i >= 0]
+        
+        scores = self._score(query_vec)
+        return [(int(i), float(scores[i])) for i in _top_k_indices(scores, top_k)]
+    
+    def _score(self, query_vec: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query against every stored chunk"""
+        if self._emb_scales is None:
+            return self.embeddings @ query_vec
+        
+        query_i8, query_scale = quantize_int8(query_vec)
+        return int8_dot(self.embeddings, self._emb_scales, query_i8[0], query_scale[0])
+    
+    async def _embed_query_async(self, query: str, aco: cohere.AsyncClient) -> np.ndarray:
+        """Async variant of embed_query"""
+        logger.debug("🔍 Embedding query...")
+        query_response = await aco.embed(
+            texts=[query],
+            model=Config.EMBEDDING_MODEL,
+            input_type="search_query"
+        )
+        return _normalize(query_response.embeddings[0])
+    
+    def _clear_query_cache(self):
+        """Drop all cached answers"""
+        with self._q_lock:
+            self._q_matrix = None
+            self._q_results = []
+            self._q_last_used = []
+    
+    def _lookup_query_cache(self, query_vec: np.ndarray):
+        """Return a cached answer for a near-identical query, if any"""
+        with self._q_lock:
+            if self._q_matrix is None:
+                return None
+            
+            scores = self._q_matrix @ query_vec
+            best = int(np.argmax(scores))
+            if scores[best] < Config.QUERY_CACHE_THRESHOLD:
+                return None
+            
+            self._q_clock += 1
+            self._q_last_used[best] = self._q_clock
+            return self._q_results[best]
+    
+    def _store_query_cache(self, query_vec: np.ndarray, result: Dict):
+        """Cache an answer, evicting the least recently used entry when full"""
+        with self._q_lock:
+            self._q_clock += 1
+            if self._q_matrix is None:
+                self._q_matrix = query_vec[np.newaxis, :].copy()
+                self._q_results = [result]
+                self._q_last_used = [self._q_clock]
+            elif len(self._q_results) < Config.QUERY_CACHE_SIZE:
+                self._q_matrix = np.vstack([self._q_matrix, query_vec])
+                self._q_results.append(result)
+                self._q_last_used.append(self._q_clock)
+            else:
+                slot = int(np.argmin(self._q_last_used))
+                self._q_matrix[slot] = query_vec
+                self._q_results[slot] = result
+                self._q_last_used[slot] = self._q_clock
     
-    def search(self, query: str, top_k: int = Config.TOP_K) -> List[Dict]:
+    def search(self, query: str, top_k: int = Config.TOP_K, query_vec: np.ndarray = None) -> List[Dict]:
         """Search for relevant documents"""
-        if not self.embeddings:
-            print("⚠️ No documents loaded yet")
+        if self.embeddings.shape[0] == 0:
+            logger.warning("⚠️ No documents loaded yet")
             return []
         
         try:
-            # Embed the query
-            print("🔍 Embedding query...")
-            query_response = self.co.embed(
-                texts=[query],
-                model=Config.EMBEDDING_MODEL,
-                input_type="search_query"
-            )
-            query_embedding = query_response.embeddings[0]
+            # Embed the query unless the caller already did
+            if query_vec is None:
+                query_vec = self.embed_query(query)
             
             # Calculate similarities
-            print("📊 Calculating similarities...")
-            similarities = []
-            for i, doc_embedding in enumerate(self.embeddings):
-                similarity = self._cosine_similarity(query_embedding, doc_embedding)
-                similarities.append((i, similarity))
-            
-            # Sort by similarity (highest first)
-            similarities.sort(key=lambda x: x[1], reverse=True)
+            logger.debug("📊 Calculating similarities...")
+            hits = self._rank(query_vec, top_k)
             
             # Get top-k results
             results = []
-            for i, (doc_idx, score) in enumerate(similarities[:top_k]):
+            for i, (doc_idx, score) in enumerate(hits):
                 results.append({
                     "id": i + 1,
                     "text": self.documents[doc_idx],
-                    "score": float(score),
+                    "score": score,
                     "metadata": self.metadata[doc_idx]
                 })
             
-            print(f"✅ Found {len(results)} relevant chunks")
+            logger.debug("✅ Found %s relevant chunks", len(results))
             return results
             
         except Exception as e:
-            print(f"❌ Error during search: {e}")
+            logger.error("❌ Error during search: %s", e)
             return []
     
-    def answer_question(self, question: str) -> Dict:
+    def answer_question(self, question: str, query_vec: np.ndarray = None) -> Dict:
         """Answer a question based on documents using Cohere Chat API"""
-        print(f"\n❓ Question: {question}")
+        early_result, query_vec, relevant_chunks = self._prepare_answer(question, query_vec)
+        if early_result is not None:
+            return early_result
+        
+        # Generate answer using Chat API
+        try:
+            logger.debug("🤖 Generating answer with model: %s", Config.GENERATION_MODEL)
+            response = self.co.chat(
+                message=self._build_chat_message(question, relevant_chunks),
+                model=Config.GENERATION_MODEL,
+                temperature=0.3,
+                max_tokens=500
+            )
+            return self._success_result(question, response.text, relevant_chunks, query_vec)
+            
+        except Exception as e:
+            return self._fallback_result(question, relevant_chunks, e)
+    
+    def answer_question_stream(self, question: str, query_vec: np.ndarray = None) -> Dict:
+        """Like answer_question, but a generated answer arrives as "answer_stream", a generator of text pieces.
+        
+        "status" stays "streaming" until the stream is exhausted, then becomes
+        "success", "fallback" (failed before any text) or "interrupted" (partial answer).
+        """
+        early_result, query_vec, relevant_chunks = self._prepare_answer(question, query_vec)
+        if early_result is not None:
+            return early_result
+        
+        result = {
+            "question": question,
+            "sources": relevant_chunks,
+            "status": "streaming",
+            "model_used": Config.GENERATION_MODEL
+        }
+        result["answer_stream"] = self._stream_answer(question, relevant_chunks, query_vec, result)
+        return result
+    
+    def _stream_answer(self, question: str, relevant_chunks: List[Dict], query_vec: np.ndarray, result: Dict) -> Iterator[str]:
+        """Yield the answer as the model generates it, recording the final status in result"""
+        pieces = []
+        try:
+            logger.debug("🤖 Streaming answer with model: %s", Config.GENERATION_MODEL)
+            for event in self.co.chat_stream(
+                message=self._build_chat_message(question, relevant_chunks),
+                model=Config.GENERATION_MODEL,
+                temperature=0.3,
+                max_tokens=500
+            ):
+                if event.event_type == "text-generation":
+                    pieces.append(event.text)
+                    yield event.text
+        except Exception as e:
+            if not pieces:
+                result["status"] = "fallback"
+                yield self._fallback_result(question, relevant_chunks, e)["answer"]
+            else:
+                result["status"] = "interrupted"
+                logger.error("❌ Answer stream interrupted: %s", e)
+            return
+        
+        self._success_result(question, "".join(pieces), relevant_chunks, query_vec)
+        result["status"] = "success"
+    
+    def _prepare_answer(self, question: str, query_vec: np.ndarray = None) -> Tuple[Dict, np.ndarray, List[Dict]]:
+        """Embed the question (unless already embedded) and retrieve context, or return an early result"""
+        logger.debug("❓ Question: %s", question)
         
         # Check if documents are loaded
         if not self.documents:
-            return {
-                "question": question,
-                "answer": "⚠️ No documents have been processed yet. Please upload and process a PDF first.",
-                "sources": [],
-                "status": "no_documents"
-            }
+            return self._no_documents_result(question), None, []
         
-        # 1. Search for relevant chunks
-        print("🔍 Searching for relevant information...")
-        relevant_chunks = self.search(question)
+        # Embed the question once for the cache and the search
+        if query_vec is None:
+            try:
+                query_vec = self.embed_query(question)
+            except Exception as e:
+                logger.error("❌ Error embedding question: %s", e)
+                query_vec = None
         
-        if not relevant_chunks:
-            return {
-                "question": question,
-                "answer": "❌ I couldn't find any relevant information in the document for your question.",
-                "sources": [],
-                "status": "no_results"
-            }
+        # Check the semantic cache, then search for relevant chunks
+        early_result, relevant_chunks = self._retrieve(question, query_vec)
+        return early_result, query_vec, relevant_chunks
+    
+    async def answer_question_async(self, question: str, aco: cohere.AsyncClient = None) -> Dict:
+        """Async variant of answer_question - network calls don't block the event loop.
         
-        # 2. Prepare context
-        context_parts = []
-        for chunk in relevant_chunks:
-            context_parts.append(f"[Source {chunk['id']}, Relevance: {chunk['score']:.2%}]\n{chunk['text']}")
+        An AsyncClient's connection pool belongs to the event loop it was first used on,
+        so callers running many questions on one loop should pass their own client;
+        otherwise a client is created for this call.
+        """
+        logger.debug("❓ Question: %s", question)
         
-        context = "\n\n".join(context_parts)
+        if not self.documents:
+            return self._no_documents_result(question)
+        
+        if aco is None:
+            aco = cohere.AsyncClient(Config.COHERE_API_KEY)
         
-        # 3. Generate answer using Chat API
         try:
-            print(f"🤖 Generating answer with model: {Config.GENERATION_MODEL}")
-            
-            # Prepare the chat message with context
-            chat_message = f"""You are a helpful assistant that answers questions based on the provided context.
-
-CONTEXT FROM DOCUMENT:
-{context}
-
-INSTRUCTIONS:
-1. Answer the question based ONLY on the context provided above
-2. If the context doesn't contain the answer, say "I cannot find this information in the document"
-3. Be concise and accurate
-4. Reference which source(s) you used when applicable
-5. If the question is about the document's main topic, summarize what the document is about
-
-QUESTION: {question}
-
-ANSWER:"""
-            
-            response = self.co.chat(
-                message=chat_message,
+            query_vec = await self._embed_query_async(question, aco)
+        except Exception as e:
+            logger.error("❌ Error embedding question: %s", e)
+            query_vec = None
+        
+        # Similarity search is local CPU work and needs no await
+        early_result, relevant_chunks = self._retrieve(question, query_vec)
+        if early_result is not None:
+            return early_result
+        
+        try:
+            logger.debug("🤖 Generating answer with model: %s", Config.GENERATION_MODEL)
+            response = await aco.chat(
+                message=self._build_chat_message(question, relevant_chunks),
                 model=Config.GENERATION_MODEL,
                 temperature=0.3,
                 max_tokens=500
             )
-            
-            answer = response.text.strip()
-            print(f"✅ Answer generated successfully")
-            
-            return {
-                "question": question,
-                "answer": answer,
-                "sources": relevant_chunks,
-                "status": "success",
-                "model_used": Config.GENERATION_MODEL
-            }
+            return self._success_result(question, response.text, relevant_chunks, query_vec)
             
         except Exception as e:
-            error_msg = f"❌ Error generating answer: {str(e)}"
-            print(error_msg)
-            
-            # Fallback: return simple answer based on search results
-            fallback_answer = "Based on the document, here's what I found:\n\n"
-            for i, chunk in enumerate(relevant_chunks[:3], 1):
-                fallback_answer += f"**Source {i}** (Relevance: {chunk['score']:.1%}):\n"
-                fallback_answer += f"{chunk['text'][:200]}...\n\n"
-            
+            return self._fallback_result(question, relevant_chunks, e)
+    
+    def _retrieve(self, question: str, query_vec: np.ndarray) -> Tuple[Dict, List[Dict]]:
+        """Return (cached or empty result, relevant chunks) for an embedded question"""
+        if query_vec is not None:
+            cached = self._lookup_query_cache(query_vec)
+            if cached is not None:
+                logger.debug("♻️ Returning cached answer")
+                return {**cached, "question": question, "cached": True}, []
+        
+        logger.debug("🔍 Searching for relevant information...")
+        relevant_chunks = self.search(question, query_vec=query_vec) if query_vec is not None else []
+        
+        if not relevant_chunks:
             return {
                 "question": question,
-                "answer": fallback_answer,
-                "sources": relevant_chunks,
-                "status": "fallback"
-            }
+                "answer": "❌ I couldn't find any relevant information in the document for your question.",
+                "sources": [],
+                "status": "no_results"
+            }, []
+        
+        return None, relevant_chunks
+    
+    def _build_chat_message(self, question: str, relevant_chunks: List[Dict]) -> str:
+        """Build the chat prompt from the retrieved chunks"""
+        context_parts = []
+        for chunk in relevant_chunks:
+            context_parts.append(f"[Source {chunk['id']}]\n{chunk['text']}")
+        
+        context = "\n\n".join(context_parts)
+        
+        return _PROMPT_TMPL.format(context=context, question=question)
+    
+    def _no_documents_result(self, question: str) -> Dict:
+        """Result returned when no document has been processed"""
+        return {
+            "question": question,
+            "answer": "⚠️ No documents have been processed yet. Please upload and process a PDF first.",
+            "sources": [],
+            "status": "no_documents"
+        }
+    
+    def _success_result(self, question: str, answer: str, relevant_chunks: List[Dict], query_vec: np.ndarray) -> Dict:
+        """Package a generated answer and remember it in the semantic cache"""
+        logger.debug("✅ Answer generated successfully")
+        
+        result = {
+            "question": question,
+            "answer": answer.strip(),
+            "sources": relevant_chunks,
+            "status": "success",
+            "model_used": Config.GENERATION_MODEL
+        }
+        self._store_query_cache(query_vec, result)
+        return result
+    
+    def _fallback_result(self, question: str, relevant_chunks: List[Dict], error: Exception) -> Dict:
+        """Return the raw search results when answer generation fails"""
+        logger.error("❌ Error generating answer: %s", error)
+        
+        # Fallback: return simple answer based on search results
+        fallback_answer = "Based on the document, here's what I found:\n\n"
+        for i, chunk in enumerate(relevant_chunks[:3], 1):
+            fallback_answer += f"**Source {i}** (Relevance: {chunk['score']:.1%}):\n"
+            fallback_answer += f"{chunk['text'][:200]}...\n\n"
+        
+        return {
+            "question": question,
+            "answer": fallback_answer,
+            "sources": relevant_chunks,
+            "status": "fallback"
+        }
     
     def get_stats(self) -> Dict:
         """Get system statistics"""
         return {
             "documents_loaded": len(self.documents),
-            "embeddings_created": len(self.embeddings),
+            "embeddings_created": self.embeddings.shape[0],
             "chunk_size": Config.CHUNK_SIZE,
             "top_k": Config.TOP_K,
             "embedding_model": Config.EMBEDDING_MODEL,
@@ -275,4 +659,5 @@ def test_rag():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_rag()
\ No newline at end of file
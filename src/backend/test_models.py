@@ -1,10 +1,24 @@
 # backend/test_models.py
 import cohere
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def _try_model(co: cohere.Client, model: str) -> str:
+    """Send a short chat to one model and describe the outcome"""
+    try:
+        response = co.chat(
+            message="Hello, are you working?",
+            model=model,
+            temperature=0.1,
+            max_tokens=10
+        )
+        return f"✅ SUCCESS: {model}\n   Response: {response.text}"
+    except Exception as e:
+        return f"❌ FAILED: {model}\n   Error: {str(e)[:100]}"
+
 def test_cohere_models():
     """Test which Cohere models are currently available"""
     co = cohere.Client(os.getenv("COHERE_API_KEY"))
@@ -20,20 +34,11 @@ def test_cohere_models():
     
     print("🧪 Testing Cohere models...")
     
-    for model in models_to_test:
-        try:
-            print(f"\nTesting model: {model}")
-            response = co.chat(
-                message="Hello, are you working?",
-                model=model,
-                temperature=0.1,
-                max_tokens=10
-            )
-            print(f"✅ SUCCESS: {model}")
-            print(f"   Response: {response.text}")
-        except Exception as e:
-            print(f"❌ FAILED: {model}")
-            print(f"   Error: {str(e)[:100]}")
+    # Probe all models at once; results print as they come back
+    with ThreadPoolExecutor(max_workers=len(models_to_test)) as executor:
+        futures = {executor.submit(_try_model, co, model): model for model in models_to_test}
+        for future in as_completed(futures):
+            print(f"\n{future.result()}")
 
 if __name__ == "__main__":
-    test_cohere_models()
\ No newline at end of file
+    test_cohere_models()
@@ -1,22 +1,264 @@
 import streamlit as st
+import copy
+import hashlib
+import html
+import logging
 import os
 import tempfile
 import sys
+import threading
+import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
-import time
 
-# Add backend to Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+# Backend progress is logged at INFO/DEBUG; only surface problems in the app
+logging.basicConfig(level=logging.WARNING)
 
-# Import SimpleRAGSystem with error handling
-try:
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+def _new_rag():
+    """Import the backend and build a SimpleRAGSystem with its entry points resolved"""
+    # Add backend to Python path (guarded - failed imports are retried)
+    if BACKEND_DIR not in sys.path:
+        sys.path.append(BACKEND_DIR)
     from simple_rag import SimpleRAGSystem
-    RAG_AVAILABLE = True
-except ImportError as e:
-    st.error(f"❌ Failed to import SimpleRAGSystem: {e}")
-    st.error("Make sure backend/simple_rag.py exists with SimpleRAGSystem class")
-    RAG_AVAILABLE = False
-    SimpleRAGSystem = None
+    rag = SimpleRAGSystem()
+    
+    # Resolve entry points once instead of probing with hasattr on every rerun
+    rag._process = getattr(rag, 'process_pdf', None) or getattr(rag, 'process_document', None)
+    rag._answer = getattr(rag, 'answer_question_stream', None) or getattr(rag, 'answer_question', None)
+    if rag._answer is None and hasattr(rag, 'query'):
+        rag._answer = lambda question, **kwargs: {"answer": rag.query(question), "sources": []}
+    rag._embed = getattr(rag, 'embed_query', None)
+    return rag
+
+# Backend with no document loaded, used to check the backend is available.
+# Imported lazily so the page renders before Cohere/pypdf load; failures aren't cached.
+@st.cache_resource(show_spinner=False)
+def get_rag():
+    return _new_rag()
+
+# How many processed PDFs keep a loaded backend; evicted ones reload from the document cache
+DOCUMENT_BACKENDS = 8
+
+# One backend per processed PDF, shared by every session asking about that PDF. A loaded
+# document is never swapped out, so answering needs no lock; the Cohere client and the
+# embedding cache are shared process-wide inside the backend. Failed loads aren't cached.
+@st.cache_resource(show_spinner=False, max_entries=DOCUMENT_BACKENDS)
+def get_document_rag(pdf_hash, _pdf_path):
+    rag = _new_rag()
+    if rag._process is None:
+        raise RuntimeError("RAG system missing process method!")
+    if not rag._process(_pdf_path):
+        raise RuntimeError("Failed to process PDF")
+    return rag
+
+# Read once per process, after the backend has loaded .env
+@st.cache_resource(show_spinner=False)
+def get_api_key():
+    return os.getenv("COHERE_API_KEY", "")
+
+# Exact-match answer cache, keyed by (pdf_hash, question) and shared across sessions
+ANSWER_CACHE_SIZE = 512
+
+# Minimum cosine similarity for reusing the answer to an earlier, reworded question
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+@st.cache_resource(show_spinner=False)
+def get_answer_cache():
+    return OrderedDict(), threading.Lock()
+
+# Uploads are copied to disk in 1 MiB chunks instead of as one bytes object
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+def save_upload(uploaded_file):
+    """Stream an upload to a content-addressed temp file, returning (path, hash)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+        for chunk in iter(lambda: uploaded_file.read(UPLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            tmp_file.write(chunk)
+    
+    h = hasher.hexdigest()
+    pdf_path = os.path.join(tempfile.gettempdir(), f"rag_{h}.pdf")
+    if os.path.exists(pdf_path):
+        os.unlink(tmp_file.name)
+    else:
+        os.replace(tmp_file.name, pdf_path)
+    return pdf_path, h
+
+# Question history is capped; answers longer than the preview are kept on disk
+QA_HISTORY_SIZE = 200
+ANSWER_PREVIEW_CHARS = 4096
+
+# One spill directory for the whole process, capped so sessions that simply end can't fill
+# the disk; an answer pruned here falls back to its preview
+ANSWER_SPILL_DIR = os.path.join(tempfile.gettempdir(), "rag_answers")
+ANSWER_SPILL_MAX_FILES = 1000
+
+def _unlink_quietly(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+def _prune_spilled_answers():
+    """Delete the oldest spilled answers beyond ANSWER_SPILL_MAX_FILES"""
+    files = []
+    try:
+        for dir_entry in os.scandir(ANSWER_SPILL_DIR):
+            try:
+                files.append((dir_entry.stat().st_mtime, dir_entry.path))
+            except OSError:
+                pass
+    except OSError:
+        return
+    files.sort()
+    for _, path in files[:max(0, len(files) - ANSWER_SPILL_MAX_FILES)]:
+        _unlink_quietly(path)
+
+def store_answer(answer):
+    """Return (preview, answer_path), writing the full answer to disk only if it's truncated"""
+    if len(answer) <= ANSWER_PREVIEW_CHARS:
+        return answer, None
+    
+    os.makedirs(ANSWER_SPILL_DIR, exist_ok=True)
+    answer_path = os.path.join(ANSWER_SPILL_DIR, f"{uuid.uuid4().hex}.txt")
+    with open(answer_path, "w", encoding="utf-8") as f:
+        f.write(answer)
+    _prune_spilled_answers()
+    return answer[:ANSWER_PREVIEW_CHARS], answer_path
+
+def full_answer(entry):
+    """Full answer for a history entry, read back from disk if it was truncated"""
+    if entry.get("answer_path"):
+        try:
+            with open(entry["answer_path"], encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            pass
+    return entry["answer"]
+
+def add_to_history(entry):
+    """Append a history entry, deleting the spilled answer of the entry it evicts"""
+    history = st.session_state.qa_history
+    if len(history) == history.maxlen and history[0].get("answer_path"):
+        _unlink_quietly(history[0]["answer_path"])
+    history.append(entry)
+
+def clear_history():
+    """Empty the question history and delete its spilled answers"""
+    for entry in st.session_state.qa_history:
+        if entry.get("answer_path"):
+            _unlink_quietly(entry["answer_path"])
+    st.session_state.qa_history = deque(maxlen=QA_HISTORY_SIZE)
+
+def _do_answer(rag, question, q_emb=None):
+    """Ask the backend a question, returning (answer, sources, status)"""
+    # Reuse the question embedding if we already have one
+    kwargs = {"query_vec": q_emb} if q_emb is not None else {}
+    
+    if rag._answer is None:
+        st.error("RAG system missing query method!")
+        return "System error: No query method found", [], None
+    
+    result = rag._answer(question, **kwargs)
+    
+    # Stream the answer into a placeholder when supported
+    if "answer_stream" in result:
+        stream_placeholder = st.empty()
+        with stream_placeholder.container():
+            answer = st.write_stream(result["answer_stream"])
+        stream_placeholder.empty()
+    else:
+        answer = result.get("answer", "No answer provided")
+    return answer, result.get("sources", []), result.get("status")
+
+def _html_text(text):
+    """Escape PDF text for raw HTML, keeping line breaks and no blank lines"""
+    return html.escape(str(text)).replace("$", "&#36;").replace("\n", "<br>")
+
+def sources_html(sources):
+    """All sources as native <details> blocks, rendered with a single st.markdown"""
+    blocks = []
+    for i, source in enumerate(sources):
+        if isinstance(source, dict):
+            body = _html_text(source.get("text", "No text"))
+            if "metadata" in source:
+                meta = _html_text(source["metadata"].get("source", "Unknown"))
+                body += f'<div class="source-meta">From: {meta}</div>'
+        else:
+            body = _html_text(source)
+        blocks.append(f'<details><summary>Source {i+1}</summary><div class="source-box">{body}</div></details>')
+    return "".join(blocks)
+
+def embed_question(rag, question):
+    """Normalized question embedding, or None if the backend can't provide one"""
+    if rag._embed is None:
+        return None
+    try:
+        return rag._embed(question)
+    except Exception:
+        return None
+
+def quantize_question(q_emb):
+    """int8 copy of a normalized question embedding for the history, as (q8, scale)"""
+    from quantization import quantize_int8
+    q8, scales = quantize_int8(q_emb)
+    return q8[0], float(scales[0])
+
+def semantic_cache_lookup(pdf_hash, q_emb):
+    """Return the earlier history entry asking nearly the same question about the same PDF"""
+    entries = [entry for entry in st.session_state.qa_history
+               if entry.get("pdf_hash") == pdf_hash and entry.get("q_emb") is not None]
+    if not entries:
+        return None
+    
+    # History stores question embeddings as int8; the backend's helpers (imported
+    # lazily, like numpy) score them, using simsimd when it is installed
+    import numpy as np
+    from quantization import int8_dot
+    
+    q8, q_scale = quantize_question(q_emb)
+    matrix = np.stack([entry["q_emb"][0] for entry in entries])
+    scales = np.array([entry["q_emb"][1] for entry in entries], dtype=np.float32)
+    sims = int8_dot(matrix, scales, q8, q_scale)
+    best = int(np.argmax(sims))
+    return entries[best] if sims[best] >= SEMANTIC_CACHE_THRESHOLD else None
+
+def cached_answer(pdf_hash, question):
+    """Answer a question, reusing stored answers for identical or paraphrased questions on the same PDF.
+    
+    Returns (answer, sources, q_emb); q_emb is None unless the answer is safe to reuse.
+    """
+    cache, lock = get_answer_cache()
+    key = (pdf_hash, question.strip())
+    with lock:
+        if key in cache:
+            cache.move_to_end(key)
+            answer, sources = cache[key]
+            return answer, sources, None
+    
+    # Paraphrases of earlier questions skip retrieval and the LLM
+    rag = get_document_rag(pdf_hash, st.session_state.active_pdf_path)
+    q_emb = embed_question(rag, question) if pdf_hash else None
+    if q_emb is not None:
+        entry = semantic_cache_lookup(pdf_hash, q_emb)
+        if entry is not None:
+            return full_answer(entry), entry["sources"], q_emb
+    
+    answer, sources, status = _do_answer(rag, question, q_emb)
+    
+    # Only cache fully generated answers - streams report their final status once consumed
+    if not (pdf_hash and status == "success"):
+        return answer, sources, None
+    
+    with lock:
+        cache[key] = (answer, sources)
+        if len(cache) > ANSWER_CACHE_SIZE:
+            cache.popitem(last=False)
+    return answer, sources, q_emb
 
 # Page configuration
 st.set_page_config(
@@ -26,8 +268,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS - built once per process instead of on every rerun
+@st.cache_resource(show_spinner=False)
+def _css():
+    return """
 <style>
     /* Main title */
     .main-title {
@@ -66,6 +310,12 @@ st.markdown("""
         transition: all 0.3s ease;
     }
     
+    .source-meta {
+        color: #6B7280;
+        font-size: 0.85rem;
+        margin-top: 8px;
+    }
+    
     .source-box:hover {
         background-color: #F1F5F9;
         transform: translateY(-2px);
@@ -102,56 +352,84 @@ st.markdown("""
         border-left: 4px solid #3B82F6;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_data(show_spinner=False)
+def _about_markdown():
+    return """
+        #### 🎯 What is this?
+        This is a **RAG (Retrieval-Augmented Generation) QA Bot** that allows you to:
+        
+        - **Upload** PDF documents
+        - **Ask questions** about their content
+        - **Get answers** with source references
+        
+        #### 🛠️ How it works
+        1. **Document Processing**: PDFs are split into manageable chunks
+        2. **Embedding Generation**: Each chunk is converted to vector embeddings
+        3. **Semantic Search**: Finds most relevant chunks for your question
+        4. **Answer Generation**: Creates answers based on retrieved context
+        
+        #### 📝 Usage Tips
+        1. Click **🚀 Process** after uploading a PDF
+        2. Enter your question in the text area
+        3. Click **🔍 Get Answer** to get results
+        4. Review source references for verification
+        
+        ##### 👨‍💻 Created with ❤️ for RAG QA Bot Assignment
+        """
+
+# Session state defaults (mutable values are copied per session)
+_DEFAULTS = {
+    "processed_files": [],
+    "qa_history": deque(maxlen=QA_HISTORY_SIZE),
+    "history_counter": 0,
+    "history_selected": None,
+    "processing_complete": False,
+    "current_answer": None,
+    "current_sources": [],
+    "should_process": False,
+    "should_answer": False,
+    "uploaded_file_path": None,
+    "upload_id": None,
+    "current_question": "",
+    "pdf_hash": None,
+    "active_pdf_hash": None,
+    "active_pdf_path": None,
+}
 
 # Initialize session state
 def init_session_state():
     if 'rag' not in st.session_state:
-        if RAG_AVAILABLE:
-            try:
-                st.session_state.rag = SimpleRAGSystem()
-                st.session_state.rag_initialized = True
-            except Exception as e:
-                st.error(f"Failed to initialize RAG system: {e}")
-                st.session_state.rag = None
-                st.session_state.rag_initialized = False
-        else:
+        try:
+            st.session_state.rag = get_rag()
+            st.session_state.rag_initialized = True
+        except ImportError as e:
+            st.error(f"❌ Failed to import SimpleRAGSystem: {e}")
+            st.error("Make sure backend/simple_rag.py exists with SimpleRAGSystem class")
+            st.session_state.rag = None
+            st.session_state.rag_initialized = False
+        except Exception as e:
+            st.error(f"Failed to initialize RAG system: {e}")
             st.session_state.rag = None
             st.session_state.rag_initialized = False
     
-    if 'processed_files' not in st.session_state:
-        st.session_state.processed_files = []
-    
-    if 'qa_history' not in st.session_state:
-        st.session_state.qa_history = []
-    
-    if 'processing_complete' not in st.session_state:
-        st.session_state.processing_complete = False
-    
-    if 'current_answer' not in st.session_state:
-        st.session_state.current_answer = None
-    
-    if 'current_sources' not in st.session_state:
-        st.session_state.current_sources = []
-    
-    if 'should_process' not in st.session_state:
-        st.session_state.should_process = False
-    
-    if 'should_answer' not in st.session_state:
-        st.session_state.should_answer = False
-    
-    if 'uploaded_file_path' not in st.session_state:
-        st.session_state.uploaded_file_path = None
-    
-    if 'current_question' not in st.session_state:
-        st.session_state.current_question = ""
+    for key, default in _DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = copy.copy(default)
 
 # Main function
 def main():
+    st.markdown(_css(), unsafe_allow_html=True)
+    
     # Header
     st.markdown('<h1 class="main-title">🤖 RAG QA Bot</h1>', unsafe_allow_html=True)
     st.markdown('<p class="subtitle">Upload PDFs • Ask Questions • Get Answers</p>', unsafe_allow_html=True)
     
+    # Resolve the backend only once the styles and header have been sent, so the
+    # first paint doesn't wait for the Cohere/pypdf imports
+    init_session_state()
+    
     # Check if RAG is available
     if not st.session_state.rag_initialized:
         st.error("""
@@ -214,10 +492,15 @@ class SimpleRAGSystem:
             }
             st.json(file_details)
             
-            # Save to temp file immediately
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                st.session_state.uploaded_file_path = tmp_file.name
+            # Save to a temp file named after the content, once per upload. The file is
+            # shared by every session uploading the same PDF, so Clear leaves it in place;
+            # re-save it anyway if it has disappeared (e.g. temp dir cleanup)
+            if (st.session_state.upload_id != uploaded_file.file_id
+                    or not os.path.exists(st.session_state.uploaded_file_path or "")):
+                pdf_path, h = save_upload(uploaded_file)
+                st.session_state.pdf_hash = h
+                st.session_state.uploaded_file_path = pdf_path
+                st.session_state.upload_id = uploaded_file.file_id
             
             # Process button
             col1, col2 = st.columns(2)
@@ -228,48 +511,48 @@ class SimpleRAGSystem:
             
             with col2:
                 if st.button("🗑️ Clear", use_container_width=True, key="sidebar_clear_btn"):
-                    # Clean up temp file
-                    if st.session_state.uploaded_file_path and os.path.exists(st.session_state.uploaded_file_path):
-                        try:
-                            os.unlink(st.session_state.uploaded_file_path)
-                        except:
-                            pass
-                    
                     # Reset states
                     st.session_state.processed_files = []
-                    st.session_state.qa_history = []
+                    clear_history()
                     st.session_state.processing_complete = False
                     st.session_state.current_answer = None
                     st.session_state.current_sources = []
                     st.session_state.should_process = False
                     st.session_state.should_answer = False
                     st.session_state.uploaded_file_path = None
+                    st.session_state.upload_id = None
                     st.session_state.current_question = ""
+                    st.session_state.pdf_hash = None
+                    st.session_state.active_pdf_hash = None
+                    st.session_state.active_pdf_path = None
                     st.rerun()
         
         # Handle processing if triggered
         if st.session_state.should_process and st.session_state.uploaded_file_path:
             with st.spinner("Processing PDF..."):
                 try:
-                    # Use the correct method name
-                    if hasattr(st.session_state.rag, 'process_pdf'):
-                        success = st.session_state.rag.process_pdf(st.session_state.uploaded_file_path)
-                    elif hasattr(st.session_state.rag, 'process_document'):
-                        success = st.session_state.rag.process_document(st.session_state.uploaded_file_path)
-                    else:
-                        st.error("RAG system missing process method!")
-                        success = False
+                    pdf_hash = st.session_state.pdf_hash
+                    
+                    # Each PDF is processed once and its backend shared - a PDF that is
+                    # already loaded (by any session) is just a cache lookup
+                    try:
+                        rag = get_document_rag(pdf_hash, st.session_state.uploaded_file_path)
+                    except RuntimeError as e:
+                        st.error(f"❌ {e}")
+                        rag = None
                     
-                    if success:
+                    if rag is not None:
                         st.success("✅ Document processed successfully!")
                         if uploaded_file and uploaded_file.name not in st.session_state.processed_files:
                             st.session_state.processed_files.append(uploaded_file.name)
                         st.session_state.processing_complete = True
+                        st.session_state.active_pdf_hash = pdf_hash
+                        st.session_state.active_pdf_path = st.session_state.uploaded_file_path
                         
                         # Show stats if available
-                        if hasattr(st.session_state.rag, 'get_stats'):
+                        if hasattr(rag, 'get_stats'):
                             try:
-                                stats = st.session_state.rag.get_stats()
+                                stats = rag.get_stats()
                                 st.markdown("### 📊 Statistics")
                                 if "documents_loaded" in stats:
                                     col1, col2 = st.columns(2)
@@ -280,8 +563,6 @@ class SimpleRAGSystem:
                                         st.metric("Chunk Size", f"{chunk_size}")
                             except Exception as e:
                                 st.warning(f"Could not get stats: {e}")
-                    else:
-                        st.error("❌ Failed to process PDF")
                     
                     # Reset the flag
                     st.session_state.should_process = False
@@ -304,7 +585,7 @@ class SimpleRAGSystem:
         # API Key check
         st.markdown("---")
         st.markdown("### 🔑 API Status")
-        api_key = os.getenv("COHERE_API_KEY", "")
+        api_key = get_api_key()
         if api_key and api_key != "your_cohere_api_key_here":
             st.success("✅ API Key: Configured")
         else:
@@ -355,31 +636,36 @@ class SimpleRAGSystem:
             else:
                 with st.spinner("🔍 Searching for relevant information..."):
                     try:
-                        # Get answer
-                        if hasattr(st.session_state.rag, 'answer_question'):
-                            result = st.session_state.rag.answer_question(st.session_state.current_question)
-                            answer = result.get("answer", "No answer provided")
-                            sources = result.get("sources", [])
-                        elif hasattr(st.session_state.rag, 'query'):
-                            answer = st.session_state.rag.query(st.session_state.current_question)
-                            sources = []
-                        else:
-                            st.error("RAG system missing query method!")
-                            answer = "System error: No query method found"
-                            sources = []
+                        # Get answer (repeat questions come from the answer caches)
+                        answer, sources, q_emb = cached_answer(
+                            st.session_state.active_pdf_hash,
+                            st.session_state.current_question
+                        )
                         
                         # Store in session state
                         st.session_state.current_answer = answer
                         st.session_state.current_sources = sources
                         
-                        # Add to history
+                        # Add to history (oldest entries drop off), with an id that stays the same across reruns
+                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        st.session_state.history_counter += 1
+                        stable_id = hashlib.blake2b(
+                            f"{st.session_state.history_counter}|{timestamp}|{st.session_state.current_question}".encode(),
+                            digest_size=6
+                        ).hexdigest()
+                        answer_preview, answer_path = store_answer(answer)
                         history_entry = {
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            "stable_id": stable_id,
+                            "timestamp": timestamp,
                             "question": st.session_state.current_question,
-                            "answer": answer,
-                            "sources_count": len(sources)
+                            "answer": answer_preview,
+                            "answer_path": answer_path,
+                            "sources": sources,
+                            "sources_count": len(sources),
+                            "pdf_hash": st.session_state.active_pdf_hash,
+                            "q_emb": quantize_question(q_emb) if q_emb is not None else None
                         }
-                        st.session_state.qa_history.append(history_entry)
+                        add_to_history(history_entry)
                         
                         # Reset the flag
                         st.session_state.should_answer = False
@@ -399,16 +685,7 @@ class SimpleRAGSystem:
             if st.session_state.current_sources:
                 st.markdown(f"### 📚 Relevant Sources ({len(st.session_state.current_sources)} found)")
                 
-                for i, source in enumerate(st.session_state.current_sources):
-                    with st.expander(f"Source {i+1}"):
-                        st.markdown('<div class="source-box">', unsafe_allow_html=True)
-                        if isinstance(source, dict):
-                            st.write(source.get("text", "No text"))
-                            if "metadata" in source:
-                                st.caption(f"From: {source['metadata'].get('source', 'Unknown')}")
-                        else:
-                            st.write(str(source))
-                        st.markdown('</div>', unsafe_allow_html=True)
+                st.markdown(sources_html(st.session_state.current_sources), unsafe_allow_html=True)
     
     with tab2:
         st.markdown("### 📚 Question History")
@@ -416,59 +693,42 @@ class SimpleRAGSystem:
         if not st.session_state.qa_history:
             st.info("No questions asked yet. Go to 'Ask Questions' tab to start!")
         else:
-            # Show history in reverse chronological order
-            for i, entry in enumerate(reversed(st.session_state.qa_history)):
-                with st.container():
-                    st.markdown(f'<div class="history-item">', unsafe_allow_html=True)
-                    
-                    col1, col2 = st.columns([4, 1])
-                    with col1:
-                        st.markdown(f"**Q:** {entry['question']}")
-                        # Show first 150 characters of answer
-                        if len(entry['answer']) > 150:
-                            preview = entry['answer'][:150] + "..."
-                        else:
-                            preview = entry['answer']
-                        st.markdown(f"**A:** {preview}")
-                    with col2:
-                        st.caption(entry['timestamp'])
-                        st.caption(f"{entry['sources_count']} sources")
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    # Show full answer on click
-                    if st.button(f"View Details", key=f"detail_{i}_{int(time.time())}"):
-                        st.write(f"**Full Answer:**")
-                        st.write(entry["answer"])
-                    
-                    st.markdown("---")
+            # pandas is only needed once there is history to show
+            import pandas as pd
+            
+            # Show history in reverse chronological order as one table
+            history = list(reversed(st.session_state.qa_history))
+            df = pd.DataFrame(history).set_index("stable_id", drop=False)
+            answers = df["answer"].astype(str)
+            df["preview"] = answers.where(answers.str.len() <= 150, answers.str.slice(0, 150) + "...")
+            st.dataframe(
+                df[["timestamp", "question", "preview", "sources_count"]],
+                use_container_width=True,
+                height=400,
+                hide_index=True
+            )
+            
+            # Show full answer for one selected entry. A new question changes the options,
+            # which gives the selectbox a new widget id, so restore the selection by stable id
+            with st.expander("🔍 View Details"):
+                options = df.index.tolist()
+                previous = st.session_state.history_selected
+                selected = st.selectbox(
+                    "Question",
+                    options=options,
+                    index=options.index(previous) if previous in options else 0,
+                    format_func=lambda i: f"{df.at[i, 'timestamp']} - {df.at[i, 'question']}",
+                    key="history_detail"
+                )
+                st.session_state.history_selected = selected
+                st.write(f"**Full Answer:**")
+                entry = next(e for e in history if e["stable_id"] == selected)
+                st.write(full_answer(entry))
     
     with tab3:
         st.markdown("### ℹ️ About This App")
-        st.markdown("""
-        #### 🎯 What is this?
-        This is a **RAG (Retrieval-Augmented Generation) QA Bot** that allows you to:
-        
-        - **Upload** PDF documents
-        - **Ask questions** about their content
-        - **Get answers** with source references
-        
-        #### 🛠️ How it works
-        1. **Document Processing**: PDFs are split into manageable chunks
-        2. **Embedding Generation**: Each chunk is converted to vector embeddings
-        3. **Semantic Search**: Finds most relevant chunks for your question
-        4. **Answer Generation**: Creates answers based on retrieved context
-        
-        #### 📝 Usage Tips
-        1. Click **🚀 Process** after uploading a PDF
-        2. Enter your question in the text area
-        3. Click **🔍 Get Answer** to get results
-        4. Review source references for verification
-        
-        ##### 👨‍💻 Created with ❤️ for RAG QA Bot Assignment
-        """)
+        st.markdown(_about_markdown())
 
 # Run the app
 if __name__ == "__main__":
-    init_session_state()
     main()
\ No newline at end of file
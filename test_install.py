@@ -1,34 +1,21 @@
-print("Testing Python 3.13 installation...")
-
-# Test basic imports
-try:
-    import streamlit as st
-    print("✅ streamlit: OK")
-except Exception as e:
-    print(f"❌ streamlit: {e}")
+import importlib.metadata
+import importlib.util
 
-try:
-    import cohere
-    print("✅ cohere: OK")
-except Exception as e:
-    print(f"❌ cohere: {e}")
-
-try:
-    import pypdf
-    print("✅ pypdf: OK")
-except Exception as e:
-    print(f"❌ pypdf: {e}")
+print("Testing Python 3.13 installation...")
 
-try:
-    import numpy as np
-    print(f"✅ numpy: OK (version {np.__version__})")
-except Exception as e:
-    print(f"❌ numpy: {e}")
+# Check packages with find_spec - locates them without running their imports
+PACKAGES = ("streamlit", "cohere", "pypdf", "numpy", "pandas")
+VERSIONED = {"numpy", "pandas"}
 
-try:
-    import pandas as pd
-    print(f"✅ pandas: OK (version {pd.__version__})")
-except Exception as e:
-    print(f"❌ pandas: {e}")
+for name in PACKAGES:
+    if importlib.util.find_spec(name) is None:
+        print(f"❌ {name}: not installed")
+    elif name in VERSIONED:
+        try:
+            print(f"✅ {name}: OK (version {importlib.metadata.version(name)})")
+        except importlib.metadata.PackageNotFoundError:
+            print(f"✅ {name}: OK")
+    else:
+        print(f"✅ {name}: OK")
 
 print("\n🎉 If you see all ✅, you're ready to proceed!")